@@ -4,7 +4,7 @@ FastHTML web application demonstrating queue-with-background + webhook callback
 This app provides:
 - A web interface for submitting long-running prompts to OpenAI
 - Background processing with webhook callbacks
-- Real-time status polling using HTMX
+- Real-time status updates pushed over Server-Sent Events (with HTMX polling fallback)
 - Secure webhook verification
 
 Endpoints:
@@ -12,183 +12,356 @@ Endpoints:
 - POST /api/queue: Queue a new background task
 - POST /api/webhook: Receive OpenAI webhook callbacks
 - GET /api/status/<id>: Check task status and get results
+- GET /api/stream/<id>: Server-Sent Events stream that pushes the final status
 """
 
 import asyncio
-import json
+import hashlib
+import html
+import logging
 import os
+import sys
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional
+import orjson
 from fasthtml.common import *
+from redis.asyncio import Redis
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
 
 # Import our OpenAI client (local to this directory)
 from openai_client import openai_client
 
-# In-memory storage for task results
-# In production, you'd use Redis, PostgreSQL, or another persistent store
-task_storage: Dict[str, Dict[str, Any]] = {}
+logger = logging.getLogger(__name__)
+
+# uvloop's libuv-based event loop dispatches I/O faster than the default
+# asyncio loop; it isn't available on Windows
+if sys.platform != "win32":
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Task state lives in Redis so every serverless instance sees the same tasks.
+# Each task is a hash at "task:<id>"; ids still in flight are kept in the
+# "active_tasks_by_time" sorted set (scored by creation time) for admin listing.
+redis_client = Redis.from_url(
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    decode_responses=True
+)
+
+# How long finished (or abandoned) tasks are kept before Redis evicts them
+TASK_TTL_SECONDS = 3600
+ACTIVE_TASKS_KEY = "active_tasks_by_time"
+
+# Task hash fields read when rendering a status; the prompt and timestamps
+# are left in Redis
+STATUS_FIELDS = ("status", "output", "error")
+
+# Largest webhook body we are willing to buffer; anything bigger is rejected
+# before it can exhaust the function's memory. OpenAI events only reference
+# the response, so they are far smaller than this.
+MAX_WEBHOOK_BYTES = 64 * 1024
+
+# Longest time a status stream waits for a task to finish before handing the
+# current state back to the browser (which then reconnects)
+STREAM_TIMEOUT_SECONDS = 50
+
+# How often a misconfigured deployment re-checks its environment variables
+CONFIG_CHECK_INTERVAL_SECONDS = 60
+config_status: Dict[str, Any] = {"error": None, "checked_at": None}
+
+# Static assets live next to this file; their URLs carry a content hash, so
+# browsers can cache them indefinitely and still pick up changes on deploy
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+with open(os.path.join(STATIC_DIR, "app.css"), "rb") as f:
+    STYLESHEET_VERSION = hashlib.sha256(f.read()).hexdigest()[:12]
+
+# Polling is only a fallback for browsers without EventSource support. Each
+# poll schedules the next one, backing off from 500ms up to a 5s cap.
+POLL_INITIAL_DELAY_MS = 500
+POLL_MAX_DELAY_MS = 5000
+
+
+def poll_delay_ms(poll_count: int) -> int:
+    """Delay before the next fallback poll, doubling with each poll made so far."""
+    return min(POLL_MAX_DELAY_MS, POLL_INITIAL_DELAY_MS * 2 ** min(poll_count, 4))
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse that serializes with orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def task_key(task_id: str) -> str:
+    """Redis key holding the hash for a task."""
+    return f"task:{task_id}"
+
+
+def task_events_channel(task_id: str) -> str:
+    """Redis pub/sub channel announcing status changes for a task."""
+    return f"task:{task_id}:events"
+
+
+async def load_task_status(task_id: str) -> Dict[str, str]:
+    """
+    Fetch just the fields needed to render a task's status.
+    
+    Returns an empty dict if the task doesn't exist (or has expired).
+    """
+    values = await redis_client.hmget(task_key(task_id), STATUS_FIELDS)
+    return {
+        field: value
+        for field, value in zip(STATUS_FIELDS, values)
+        if value is not None
+    }
+
+
+async def read_limited_body(request: Request, limit: int) -> Optional[bytes]:
+    """
+    Read the request body, giving up as soon as it grows past ``limit`` bytes.
+    
+    At most ``limit`` plus one received chunk is ever held in memory, but
+    only if nothing has read the body beforehand: FastHTML's @rt handlers
+    get a request whose body is already buffered in full, so endpoints that
+    rely on this cap are registered as plain Starlette routes.
+    
+    Returns None when the body is too large.
+    """
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > limit:
+            return None
+    return bytes(body)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks every response as cacheable for a year."""
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+class TaskUpdateBatcher:
+    """
+    Coalesces finished-task writes from concurrent webhooks into shared pipelines.
+    
+    A single worker drains whatever updates are queued (up to ``max_batch``)
+    into one Redis pipeline. Each caller still awaits its own write, so a
+    webhook is only acknowledged once its result is stored; updates that
+    arrive while a pipeline is in flight simply go out together in the next one.
+    """
+    
+    def __init__(self, max_batch: int = 100):
+        self.max_batch = max_batch
+        self._loop = None
+        self._queue = None
+        self._worker = None
+    
+    async def submit(self, task_id: str, update: Dict[str, Any]):
+        """Store a task's final state, retire it and notify its listeners."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker.done():
+            # The queue and worker belong to the loop they were created on
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        written = loop.create_future()
+        self._queue.put_nowait((task_id, update, written))
+        await written
+    
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for task_id, update, _ in batch:
+                        key = task_key(task_id)
+                        pipe.hset(key, mapping=update)
+                        # Re-arm the TTL: the result is kept for a full hour,
+                        # and a hash that expired since the webhook checked
+                        # for it can't be recreated without one
+                        pipe.expire(key, TASK_TTL_SECONDS)
+                        pipe.zrem(ACTIVE_TASKS_KEY, task_id)
+                        pipe.publish(task_events_channel(task_id), update["status"])
+                    await pipe.execute()
+            except Exception as e:
+                for _, _, written in batch:
+                    if not written.done():
+                        written.set_exception(e)
+            else:
+                for _, _, written in batch:
+                    if not written.done():
+                        written.set_result(None)
+
+
+task_updates = TaskUpdateBatcher()
+
+
+async def close_connections():
+    """Release pooled OpenAI and Redis connections on shutdown."""
+    await openai_client.close()
+    await redis_client.aclose()
 
 # Create the FastHTML app with explicit secret key to avoid filesystem writes
 app, rt = fast_app(
     # Provide a secret key to prevent FastHTML from trying to write .sesskey file in serverless env
     secret_key="demo-secret-key-for-serverless-deployment",
+    on_shutdown=[close_connections],
+    # Compress HTML, CSS and JSON responses; tiny responses aren't worth it
+    middleware=[Middleware(GZipMiddleware, minimum_size=500)],
     hdrs=[
         # Include HTMX for dynamic frontend interactions
         Script(src="https://unpkg.com/htmx.org@1.9.9"),
-        # Basic styling for a clean interface
-        Style("""
-            body { 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                max-width: 800px; 
-                margin: 0 auto; 
-                padding: 20px;
-                line-height: 1.6;
-            }
-            .container { margin: 20px 0; }
-            .form-group { margin: 15px 0; }
-            label { display: block; margin-bottom: 5px; font-weight: 500; }
-            textarea, button { 
-                width: 100%; 
-                padding: 12px; 
-                border: 1px solid #ddd; 
-                border-radius: 6px;
-                font-size: 14px;
-            }
-            textarea { 
-                min-height: 120px; 
-                resize: vertical; 
-                font-family: inherit;
-            }
-            button { 
-                background: #007bff; 
-                color: white; 
-                border: none; 
-                cursor: pointer;
-                font-weight: 500;
-            }
-            button:hover { background: #0056b3; }
-            button:disabled { 
-                background: #6c757d; 
-                cursor: not-allowed; 
-            }
-            .status { 
-                padding: 15px; 
-                border: 1px solid #ddd; 
-                border-radius: 6px; 
-                margin: 15px 0;
-                background: #f8f9fa;
-            }
-            .status.loading { border-color: #007bff; }
-            .status.completed { border-color: #28a745; background: #d4edda; }
-            .status.error { border-color: #dc3545; background: #f8d7da; }
-            .result { 
-                white-space: pre-wrap; 
-                background: white; 
-                padding: 15px; 
-                border-radius: 4px;
-                margin-top: 10px;
-                border: 1px solid #e9ecef;
-            }
-            .spinner {
-                display: inline-block;
-                width: 16px;
-                height: 16px;
-                border: 2px solid #f3f3f3;
-                border-top: 2px solid #007bff;
-                border-radius: 50%;
-                animation: spin 1s linear infinite;
-                margin-right: 8px;
-            }
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-        """)
+        # HTMX extension for receiving status updates over Server-Sent Events
+        Script(src="https://unpkg.com/htmx.org@1.9.9/dist/ext/sse.js"),
+        # Basic styling for a clean interface, served as a cacheable static file
+        Link(rel="stylesheet", href=f"/static/app.css?v={STYLESHEET_VERSION}"),
     ]
 )
 
-@rt("/")
-async def homepage():
+# Mounted ahead of FastHTML's catch-all static route, which would otherwise
+# claim any *.css path
+app.router.routes.insert(0, Mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static"))
+
+def render_full_page(page) -> bytes:
     """
-    Main page with form for submitting prompts and displaying results.
+    Render a Titled(...) page to a complete HTML document.
     
-    Uses HTMX to:
-    - Submit forms without page refresh
-    - Poll for status updates every 2 seconds
-    - Swap content dynamically based on task status
+    This wraps the page with the app's headers the same way FastHTML does for
+    route responses, so static pages can be rendered once and served as bytes.
     """
-    # Check if environment variables are configured
-    try:
-        openai_client._ensure_client()
-    except ValueError as e:
-        return Titled("Configuration Required",
+    title, main = page
+    return to_xml(Html(
+        Head(title, *flat_xt(app.hdrs)),
+        Body(main, *flat_xt(app.ftrs), **app.bodykw),
+        **app.htmlkw
+    )).encode()
+
+# The main page is static, so it is rendered once at import
+HOMEPAGE_HTML = render_full_page(Titled("OpenAI Background Processing Demo",
+    Div(
+        H1("OpenAI Background Processing Demo"),
+        P("Submit a prompt below. It will be processed in the background using OpenAI's API, "
+          "and you'll see real-time updates as the task completes."),
+        
+        # Main form for submitting prompts
+        Form(
             Div(
-                H1("⚙️ Configuration Required"),
-                P("Your FastHTML + OpenAI webhook demo is deployed, but needs configuration:"),
-                
-                Div(
-                    H3("🔧 Required Environment Variables"),
-                    P("Please set these in your Vercel dashboard:"),
-                    Pre("""OPENAI_API_KEY=your_openai_api_key_here
-OPENAI_WEBHOOK_SECRET=your_webhook_secret_here""", 
-                        style="background: #f5f5f5; padding: 15px; border-radius: 5px;"),
-                    
-                    H3("🔗 Webhook URL"),
-                    P("Configure this URL in your OpenAI dashboard:"),
-                    Pre("https://deep-credit-app.vercel.app/api/webhook", 
-                        style="background: #f5f5f5; padding: 15px; border-radius: 5px;"),
-                    
-                    P(f"Error: {str(e)}", style="color: red; font-style: italic;"),
-                    
-                    cls="container"
+                Label("Enter your prompt:", For="prompt"),
+                Textarea(
+                    placeholder="Ask me anything... For example: 'Write a short story about a robot learning to paint'",
+                    name="prompt",
+                    id="prompt",
+                    required=True
                 ),
-                
-                cls="container"
-            )
-        )
-    return Titled("OpenAI Background Processing Demo",
-        Div(
-            H1("OpenAI Background Processing Demo"),
-            P("Submit a prompt below. It will be processed in the background using OpenAI's API, "
-              "and you'll see real-time updates as the task completes."),
+                cls="form-group"
+            ),
             
-            # Main form for submitting prompts
-            Form(
-                Div(
-                    Label("Enter your prompt:", For="prompt"),
-                    Textarea(
-                        placeholder="Ask me anything... For example: 'Write a short story about a robot learning to paint'",
-                        name="prompt",
-                        id="prompt",
-                        required=True
-                    ),
-                    cls="form-group"
+            Div(
+                Button(
+                    "Queue Task",
+                    type="submit",
+                    id="submit-btn"
                 ),
+                cls="form-group"
+            ),
+            
+            # HTMX attributes for form submission
+            hx_post="/api/queue",
+            hx_target="#status-container",
+            hx_swap="innerHTML",
+            # Disable the submit button during request
+            hx_disabled_elt="#submit-btn"
+        ),
+        
+        # Container where status updates will be displayed
+        Div(id="status-container", cls="container"),
+        
+        cls="container"
+    )
+))
+
+@lru_cache
+def config_page_html(error: str) -> bytes:
+    """Render the configuration-required page for a given error message."""
+    return render_full_page(Titled("Configuration Required",
+        Div(
+            H1("⚙️ Configuration Required"),
+            P("Your FastHTML + OpenAI webhook demo is deployed, but needs configuration:"),
+            
+            Div(
+                H3("🔧 Required Environment Variables"),
+                P("Please set these in your Vercel dashboard:"),
+                Pre("""OPENAI_API_KEY=your_openai_api_key_here
+OPENAI_WEBHOOK_SECRET=your_webhook_secret_here""", 
+                    style="background: #f5f5f5; padding: 15px; border-radius: 5px;"),
                 
-                Div(
-                    Button(
-                        "Queue Task",
-                        type="submit",
-                        id="submit-btn"
-                    ),
-                    cls="form-group"
-                ),
+                H3("🔗 Webhook URL"),
+                P("Configure this URL in your OpenAI dashboard:"),
+                Pre("https://deep-credit-app.vercel.app/api/webhook", 
+                    style="background: #f5f5f5; padding: 15px; border-radius: 5px;"),
                 
-                # HTMX attributes for form submission
-                hx_post="/api/queue",
-                hx_target="#status-container",
-                hx_swap="innerHTML",
-                # Disable the submit button during request
-                hx_disabled_elt="#submit-btn"
+                P(f"Error: {error}", style="color: red; font-style: italic;"),
+                
+                cls="container"
             ),
             
-            # Container where status updates will be displayed
-            Div(id="status-container", cls="container"),
-            
             cls="container"
         )
-    )
+    ))
+
+def configuration_error() -> Optional[str]:
+    """
+    Return why the app isn't configured yet, or None once it is.
+    
+    The result is cached; while configuration is missing it is re-checked
+    (re-reading the environment) at most every CONFIG_CHECK_INTERVAL_SECONDS.
+    """
+    now = time.monotonic()
+    checked_at = config_status["checked_at"]
+    if checked_at is None or (
+        config_status["error"] and now - checked_at >= CONFIG_CHECK_INTERVAL_SECONDS
+    ):
+        if checked_at is not None:
+            openai_client.load_config()
+        try:
+            openai_client._ensure_client()
+            config_status["error"] = None
+        except ValueError as e:
+            config_status["error"] = str(e)
+        config_status["checked_at"] = now
+    return config_status["error"]
+
+# Check configuration once at import so the homepage doesn't on every request
+configuration_error()
+
+@rt("/")
+async def homepage():
+    """
+    Main page with form for submitting prompts and displaying results.
+    
+    Uses HTMX to:
+    - Submit forms without page refresh
+    - Receive status updates over Server-Sent Events
+    - Swap content dynamically based on task status
+    """
+    # Check if environment variables are configured
+    error = configuration_error()
+    if error:
+        return HTMLResponse(config_page_html(error))
+    return HTMLResponse(HOMEPAGE_HTML)
 
 @rt("/api/queue")
 async def queue_task(request: Request):
@@ -199,136 +372,186 @@ async def queue_task(request: Request):
         prompt = form_data.get("prompt", "").strip()
         
         if not prompt:
-            return Div(
-                P("❌ Error: Please provide a prompt"),
-                cls="status error"
-            )
+            return queue_error_html("❌ Error: Please provide a prompt")
         
-        # Get the base URL for webhook callbacks
-        base_url = str(request.base_url).rstrip('/')
-        webhook_url = f"{base_url}/api/webhook"
-        
-        # Create background task with OpenAI
+        # Create background task with OpenAI. Completion is reported to the
+        # webhook configured for the project in the OpenAI dashboard.
         try:
-            print(f"Attempting OpenAI API call with prompt: {prompt[:50]}...")
-            print(f"Webhook URL: {webhook_url}")
-            
-            response = await openai_client.create_background_response(
-                prompt=prompt,
-                webhook_url=webhook_url
-            )
-            
-            print(f"OpenAI response received: {response}")
+            response = await openai_client.create_background_response(prompt=prompt)
             
         except Exception as openai_error:
             # Log the actual error for debugging
-            print(f"OpenAI API Error: {str(openai_error)}")
-            print(f"Error type: {type(openai_error)}")
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
-            return Div(
-                P(f"❌ OpenAI API Error: {str(openai_error)}"),
-                P(f"Error type: {type(openai_error).__name__}"),
-                cls="status error"
+            logger.debug("OpenAI API error", exc_info=True)
+            return queue_error_html(
+                f"❌ OpenAI API Error: {str(openai_error)}",
+                f"Error type: {type(openai_error).__name__}"
             )
         
         task_id = response["id"]
         
-        # Store initial task state in memory  
-        task_storage[task_id] = {
+        # Store initial task state in Redis
+        key = task_key(task_id)
+        task = {
             "id": task_id,
             "prompt": prompt,
-            "status": "queued",  # Will be updated to "processing" then "completed" via webhook
-            "output": None,
-            "created_at": asyncio.get_event_loop().time(),
-            "webhook_url": webhook_url
+            "status": "queued",  # Updated to "completed" or "failed" via webhook
+            "output": "",
+            "created_at": time.time()
         }
+        if "content" in response:
+            # Without background mode the answer is already here
+            task.update({
+                "status": "completed",
+                "output": response["content"],
+                "completed_at": task["created_at"]
+            })
+        # Send all writes in a single round-trip
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=task)
+            pipe.expire(key, TASK_TTL_SECONDS)
+            if task["status"] == "queued":
+                pipe.zadd(ACTIVE_TASKS_KEY, {task_id: task["created_at"]})
+            # Drop ids whose task hash has already expired without a webhook,
+            # so the index can't grow without bound
+            pipe.zremrangebyscore(
+                ACTIVE_TASKS_KEY, "-inf", task["created_at"] - TASK_TTL_SECONDS
+            )
+            await pipe.execute()
         
         # OpenAI will call our /api/webhook endpoint when processing completes
         
-        # Return HTMX response that starts polling for status
-        return Div(
-            Div(
-                Span(cls="spinner"),
-                f"Task queued! ID: {task_id}",
-                cls="status loading"
-            ),
-            # HTMX polling: check status every 2 seconds
-            Div(
-                id="status-updates",
-                hx_get=f"/api/status/{task_id}",
-                hx_trigger="every 2s",
-                hx_swap="outerHTML"
-            )
-        )
+        # Return HTMX response that listens for status updates
+        return HTMLResponse(QUEUED_TEMPLATE.format(task_id=html.escape(task_id)))
         
     except Exception as e:
-        return Div(
-            P(f"❌ Error: {str(e)}"),
-            cls="status error"
-        )
+        return queue_error_html(f"❌ Error: {str(e)}")
 
-@rt("/api/webhook")
 async def webhook_callback(request: Request):
-    """Receive webhook callbacks from OpenAI when background tasks complete."""
+    """
+    Receive webhook callbacks from OpenAI when background tasks complete.
+    
+    Registered as a plain Starlette route (below) rather than with @rt:
+    FastHTML reads and parses the whole body before calling its handlers,
+    which would defeat the header checks and the capped body read here.
+    """
     try:
-        body = await request.body()
-        signature = request.headers.get("X-OpenAI-Signature", "")
+        # Reject unsigned and declared-oversize requests from the headers alone,
+        # before reading any of the body
+        headers = request.headers
+        if not (headers.get("webhook-signature") and headers.get("webhook-id")):
+            return ORJSONResponse(
+                {"error": "Invalid webhook signature"}, 
+                status_code=401
+            )
         
-        if not openai_client.verify_webhook_signature(body, signature):
-            return JSONResponse(
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_WEBHOOK_BYTES:
+            return ORJSONResponse(
+                {"error": "Payload too large"}, 
+                status_code=413
+            )
+        
+        # Content-Length may be absent (chunked) or wrong, so the read is capped too
+        body = await read_limited_body(request, MAX_WEBHOOK_BYTES)
+        if body is None:
+            return ORJSONResponse(
+                {"error": "Payload too large"}, 
+                status_code=413
+            )
+        
+        if not openai_client.verify_webhook_signature(body, headers):
+            return ORJSONResponse(
                 {"error": "Invalid webhook signature"}, 
                 status_code=401
             )
         
         payload = openai_client.parse_webhook_payload(body)
         if not payload:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Invalid payload format"}, 
                 status_code=400
             )
         
-        task_id = payload.get("id")
+        # Webhook events reference the response in "data"; fall back to a
+        # top-level id for payloads that carry the response directly
+        data = payload.get("data")
+        task_id = (data.get("id") if isinstance(data, dict) else None) or payload.get("id")
         event_type = payload.get("type", "")
         
-        if not task_id or task_id not in task_storage:
-            return JSONResponse(
+        if not task_id or not await redis_client.exists(task_key(task_id)):
+            return ORJSONResponse(
                 {"error": "Task not found"}, 
                 status_code=404
             )
         
         if event_type == "response.completed":
-            output_text = payload.get("output", {}).get("text", "")
-            task_storage[task_id].update({
+            output = payload.get("output")
+            output_text = output.get("text") if isinstance(output, dict) else None
+            if output_text is None:
+                output_text = await openai_client.get_response_output(task_id)
+            update = {
                 "status": "completed",
                 "output": output_text,
-                "completed_at": asyncio.get_event_loop().time()
-            })
+                "completed_at": time.time()
+            }
             
-        elif event_type == "response.failed":
-            error_message = payload.get("error", {}).get("message", "Unknown error")
-            task_storage[task_id].update({
+        elif event_type in ("response.failed", "response.incomplete", "response.cancelled"):
+            # Each of these is final, so the task is shown as failed with the reason
+            error = payload.get("error")
+            error_message = error.get("message") if isinstance(error, dict) else None
+            if error_message is None:
+                if event_type == "response.cancelled":
+                    error_message = "Response was cancelled"
+                else:
+                    error_message = await openai_client.get_response_error(task_id)
+            update = {
                 "status": "failed",
                 "error": error_message,
-                "completed_at": asyncio.get_event_loop().time()
-            })
+                "completed_at": time.time()
+            }
+        
+        else:
+            update = None
         
-        return JSONResponse({"status": "received"})
+        if update:
+            # Batched with any other webhooks being handled concurrently
+            await task_updates.submit(task_id, update)
+        
+        return ORJSONResponse({"status": "received"})
         
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": f"Webhook processing failed: {str(e)}"}, 
             status_code=500
         )
 
-@rt("/api/status/{task_id}")
-async def get_task_status(task_id: str):
-    """Get the current status of a background task."""
-    task = task_storage.get(task_id)
-    
+app.router.routes.insert(0, Route("/api/webhook", webhook_callback, methods=["POST"]))
+
+def status_listener(task_id: str, *children, next_poll=1, delay_ms=POLL_INITIAL_DELAY_MS):
+    """
+    Element that swaps itself for the final task status.
+
+    The status is pushed over Server-Sent Events from /api/stream/<id>; browsers
+    without EventSource support fall back to polling /api/status/<id>. Polling
+    uses a one-shot trigger, so each response carries the poll count and delay
+    for the one after it.
+    """
+    return Div(
+        *children,
+        id="status-updates",
+        hx_ext="sse",
+        sse_connect=f"/api/stream/{task_id}",
+        sse_swap="message",
+        hx_get=f"/api/status/{task_id}?n={next_poll}",
+        hx_trigger=f"load[!window.EventSource] delay:{delay_ms}ms",
+        hx_swap="outerHTML"
+    )
+
+def render_task_status(task_id: str, task: Dict[str, str], next_poll=1, delay_ms=POLL_INITIAL_DELAY_MS):
+    """Build the status fragment for a task as stored in Redis."""
     if not task:
         return Div(
-            P("❌ Task not found"),
+            P("❌ Task not found or expired (results are kept for 1 hour)"),
             cls="status error",
             id="status-updates"
         )
@@ -337,16 +560,15 @@ async def get_task_status(task_id: str):
     
     if status in ["queued", "processing"]:
         status_text = "Queued..." if status == "queued" else "Processing..."
-        return Div(
+        return status_listener(
+            task_id,
             Div(
                 Span(cls="spinner"),
                 f"{status_text} (Task ID: {task_id})",
                 cls="status loading"
             ),
-            id="status-updates",
-            hx_get=f"/api/status/{task_id}",
-            hx_trigger="every 2s",
-            hx_swap="outerHTML"
+            next_poll=next_poll,
+            delay_ms=delay_ms
         )
     
     elif status == "completed":
@@ -380,20 +602,121 @@ async def get_task_status(task_id: str):
             id="status-updates"
         )
 
+# Every status fragment is rendered once at import, with placeholders for the
+# (HTML-escaped) task id, status, output or error, instead of on every request
+NOT_FOUND_HTML = to_xml(render_task_status("", {}))
+PENDING_TEMPLATES = {
+    status: to_xml(render_task_status(
+        "{task_id}", {"status": status}, next_poll="{next_poll}", delay_ms="{delay_ms}"
+    ))
+    for status in ["queued", "processing"]
+}
+COMPLETED_TEMPLATE = to_xml(render_task_status("", {"status": "completed", "output": "{output}"}))
+FAILED_TEMPLATE = to_xml(render_task_status("", {"status": "failed", "error": "{error}"}))
+UNKNOWN_STATUS_TEMPLATE = to_xml(render_task_status("", {"status": "{status}"}))
+
+# Fragments returned by /api/queue, prebuilt the same way
+QUEUED_TEMPLATE = to_xml(Div(
+    Div(
+        Span(cls="spinner"),
+        "Task queued! ID: {task_id}",
+        cls="status loading"
+    ),
+    status_listener("{task_id}")
+))
+QUEUE_ERROR_TEMPLATE = to_xml(Div("{messages}", cls="status error"))
+
+def queue_error_html(*messages: str) -> HTMLResponse:
+    """Render an /api/queue error fragment with one paragraph per message."""
+    paragraphs = "".join(f"<p>{html.escape(message)}</p>" for message in messages)
+    return HTMLResponse(QUEUE_ERROR_TEMPLATE.format(messages=paragraphs))
+
+def task_status_html(task_id: str, task: Dict[str, str], poll_count: int = 0) -> str:
+    """Render the status fragment for a task from the prebuilt templates."""
+    if not task:
+        return NOT_FOUND_HTML
+    
+    status = task["status"]
+    
+    if status in PENDING_TEMPLATES:
+        return PENDING_TEMPLATES[status].format(
+            task_id=html.escape(task_id),
+            next_poll=poll_count + 1,
+            delay_ms=poll_delay_ms(poll_count)
+        )
+    elif status == "completed":
+        return COMPLETED_TEMPLATE.format(output=html.escape(task["output"]))
+    elif status == "failed":
+        error_msg = task.get("error", "Unknown error occurred")
+        return FAILED_TEMPLATE.format(error=html.escape(error_msg))
+    else:
+        return UNKNOWN_STATUS_TEMPLATE.format(status=html.escape(status))
+
+@rt("/api/status/{task_id}")
+async def get_task_status(task_id: str, n: int = 0):
+    """
+    Get the current status of a background task.
+
+    `n` counts the fallback polls made so far and sets how long the returned
+    fragment waits before polling again.
+    """
+    task = await load_task_status(task_id)
+    return HTMLResponse(task_status_html(task_id, task, max(n, 0)))
+
+@rt("/api/stream/{task_id}")
+async def stream_task_status(task_id: str):
+    """
+    Stream the status of a background task as Server-Sent Events.
+
+    Subscribes to the task's Redis channel and sends a single status fragment
+    once the webhook reports the task as finished, so the browser never polls.
+    """
+    async def events():
+        async with redis_client.pubsub() as pubsub:
+            # Subscribe before reading the task so a completion published in
+            # between cannot be missed
+            await pubsub.subscribe(task_events_channel(task_id))
+            task = await load_task_status(task_id)
+            
+            if task and task["status"] in ["queued", "processing"]:
+                try:
+                    async with asyncio.timeout(STREAM_TIMEOUT_SECONDS):
+                        async for message in pubsub.listen():
+                            if message["type"] == "message":
+                                break
+                except TimeoutError:
+                    pass
+                task = await load_task_status(task_id)
+            
+            fragment = task_status_html(task_id, task)
+            # Every line of a multi-line payload needs its own "data:" field.
+            # SSE only breaks lines on CR, LF and CRLF (str.splitlines() splits on
+            # more, and would turn e.g. form feeds in the output into newlines)
+            lines = fragment.replace("\r\n", "\n").replace("\r", "\n").rstrip("\n").split("\n")
+            data = "\n".join(f"data: {line}" for line in lines)
+            yield f"event: message\n{data}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 @rt("/health")
 async def health_check():
     """Simple health check endpoint."""
-    return JSONResponse({"status": "healthy", "service": "openai-webhook-demo"})
+    return ORJSONResponse({"status": "healthy", "service": "openai-webhook-demo"})
 
 @rt("/debug")
 async def debug_env():
     """Debug endpoint to check environment variables."""
     import os
-    return JSONResponse({
+    return ORJSONResponse({
         "openai_api_key_set": bool(os.getenv("OPENAI_API_KEY")),
         "openai_api_key_length": len(os.getenv("OPENAI_API_KEY", "")),
         "webhook_secret_set": bool(os.getenv("OPENAI_WEBHOOK_SECRET")),
         "webhook_secret_length": len(os.getenv("OPENAI_WEBHOOK_SECRET", "")),
+        "redis_url_set": bool(os.getenv("REDIS_URL")),
         "environment": os.getenv("VERCEL", "local")
     })
 
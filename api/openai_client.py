@@ -8,16 +8,34 @@ This module provides:
 """
 
 import os
-import json
-import hmac
-import hashlib
-from typing import Dict, Any, Optional
-from openai import AsyncOpenAI
+import logging
+import secrets
+from typing import Dict, Any, Mapping, Optional
+import httpx
+import orjson
+from openai import AsyncOpenAI, InvalidWebhookSignatureError
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (for local development)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every request that goes through the global client.
+# Kept-alive connections skip the TCP + TLS handshake to api.openai.com, and
+# HTTP/2 lets concurrent requests share one connection.
+# The pool is bound to the event loop it is first used on; on Vercel warm
+# invocations reuse the same loop, so sharing it across requests is safe.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+HTTP_TIMEOUT_SECONDS = 60
+
+# Background mode suits slow reasoning models. The streaming fallback, used
+# where the Responses API is unavailable, answers within the request and so
+# defaults to a small model that fits serverless time limits.
+DEFAULT_MODEL = "o3"
+FALLBACK_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are a helpful assistant that provides detailed, thoughtful responses."
+
 
 class OpenAIClient:
     """
@@ -31,127 +49,190 @@ class OpenAIClient:
     
     def __init__(self):
         """Initialize the OpenAI client with API key from environment."""
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        self.webhook_secret = os.getenv("OPENAI_WEBHOOK_SECRET")
+        self.load_config()
         
         # Initialize client lazily to avoid startup errors
         self.client = None
     
+    def load_config(self):
+        """Read the API key, webhook secret and mode from the environment."""
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.webhook_secret = os.getenv("OPENAI_WEBHOOK_SECRET")
+        # Set OPENAI_BACKGROUND_MODE=0 to answer with streamed chat completions instead
+        self.background_mode = os.getenv("OPENAI_BACKGROUND_MODE", "1") != "0"
+    
     def _ensure_client(self):
         """Ensure the OpenAI client is initialized."""
-        print(f"_ensure_client called. API key length: {len(self.api_key) if self.api_key else 0}")
-        print(f"Webhook secret length: {len(self.webhook_secret) if self.webhook_secret else 0}")
-        
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         if not self.webhook_secret:
             raise ValueError("OPENAI_WEBHOOK_SECRET environment variable is required")
         
         if self.client is None:
-            print("Initializing OpenAI client...")
-            self.client = AsyncOpenAI(api_key=self.api_key)
-            print("OpenAI client initialized successfully")
+            self.client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=HTTP_LIMITS,
+                    timeout=HTTP_TIMEOUT_SECONDS
+                )
+            )
+            logger.debug("OpenAI client initialized")
+    
+    async def close(self):
+        """Close the underlying HTTP connection pool, if one was opened."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
     
     async def create_background_response(
         self, 
         prompt: str, 
-        webhook_url: str,
-        model: str = "o3"
+        model: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a response with background processing enabled.
         
-        This initiates a long-running task that will complete asynchronously
-        and send results to the specified webhook URL.
+        This initiates a long-running task that will complete asynchronously.
+        The call returns as soon as OpenAI has queued the response; when it
+        finishes, OpenAI sends a webhook event to the webhook URL configured
+        for the project in the OpenAI dashboard.
+        
+        With background mode disabled, the prompt is answered by a streamed
+        chat completion instead and the result includes its "content".
         
         Args:
             prompt: The user's prompt to process
-            webhook_url: URL where completion results will be sent
-            model: OpenAI model to use (defaults to gpt-4)
+            model: OpenAI model to use (defaults to o3, or gpt-4o-mini
+                without background mode)
             
         Returns:
             Dictionary containing the response ID and status
         """
         try:
             # Ensure client is initialized
-            print("About to call _ensure_client()")
             self._ensure_client()
-            print("_ensure_client() completed successfully")
             
-            # Create a completion request with background processing
-            print(f"About to call OpenAI API with model: {model}")
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a helpful assistant that provides detailed, thoughtful responses."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-            )
-            print("OpenAI API call completed successfully")
+            if not self.background_mode:
+                return await self._create_streamed_response(prompt, model or FALLBACK_MODEL)
             
-            # Extract the response content
-            content = response.choices[0].message.content
-            print(f"Extracted content length: {len(content) if content else 0}")
+            model = model or DEFAULT_MODEL
             
-            # Generate a unique ID for this response
-            response_id = f"resp_{hash(prompt + webhook_url) % 1000000}"
-            print(f"Generated response ID: {response_id}")
+            # Create a response with background processing, so we don't hold
+            # the request open for the whole inference
+            logger.debug("Calling OpenAI API", extra={"model": model})
+            response = await self.client.responses.create(
+                model=model,
+                instructions=SYSTEM_PROMPT,
+                input=prompt,
+                background=True
+            )
             
-            result = {
-                "id": response_id,
-                "status": "queued",
-                "content": content,
+            return {
+                "id": response.id,
+                "status": response.status,
                 "model": model
             }
-            print(f"Returning result: {result}")
-            return result
             
         except Exception as e:
-            print(f"Exception in create_background_response: {str(e)}")
-            print(f"Exception type: {type(e)}")
-            import traceback
-            print(f"Full traceback: {traceback.format_exc()}")
+            # exc_info is only formatted when debug logging is enabled
+            logger.debug("create_background_response failed", exc_info=True)
             raise Exception(f"Failed to create background response: {str(e)}")
     
-    def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
+    async def _create_streamed_response(self, prompt: str, model: str) -> Dict[str, Any]:
+        """
+        Answer a prompt with a streamed chat completion, for when background mode is unavailable.
+        
+        Streaming gets the first tokens back quickly; the chunks are collected
+        and joined once at the end.
+        """
+        logger.debug("Calling OpenAI API with streaming", extra={"model": model})
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            stream=True
+        )
+        
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        
+        return {
+            "id": f"resp_{secrets.token_urlsafe(12)}",
+            "status": "completed",
+            "content": "".join(parts),
+            "model": model
+        }
+    
+    async def get_response_output(self, response_id: str) -> str:
+        """
+        Fetch the output text of a finished background response.
+        
+        Webhook events only identify the response, so the text is retrieved
+        separately once OpenAI reports that it has completed.
+        
+        Args:
+            response_id: ID returned by create_background_response
+            
+        Returns:
+            The response's output text
+        """
+        self._ensure_client()
+        response = await self.client.responses.retrieve(response_id)
+        return response.output_text
+    
+    async def get_response_error(self, response_id: str) -> str:
+        """
+        Fetch the reason a background response failed or was cut short.
+        
+        Like completions, response.failed and response.incomplete events
+        only identify the response, so the details are retrieved separately.
+        
+        Args:
+            response_id: ID returned by create_background_response
+            
+        Returns:
+            The response's error message, or why it is incomplete
+        """
+        self._ensure_client()
+        response = await self.client.responses.retrieve(response_id)
+        if response.error is not None:
+            return response.error.message
+        if response.incomplete_details is not None and response.incomplete_details.reason:
+            return f"Response incomplete: {response.incomplete_details.reason}"
+        return "Unknown error"
+    
+    def verify_webhook_signature(self, payload: bytes, headers: Mapping[str, str]) -> bool:
         """
         Verify that a webhook request came from OpenAI by checking the signature.
         
-        OpenAI signs webhook payloads with HMAC-SHA256 using your webhook secret.
-        This prevents malicious actors from sending fake webhook requests.
+        OpenAI signs webhooks following the Standard Webhooks spec: the
+        webhook-signature header carries a base64 HMAC-SHA256 of
+        "<webhook-id>.<webhook-timestamp>.<body>", keyed with your webhook
+        secret. Requests whose timestamp is more than five minutes off are
+        rejected, so captured deliveries can't be replayed.
         
         Args:
             payload: Raw request body as bytes
-            signature: The X-OpenAI-Signature header value
+            headers: The request headers
             
         Returns:
             True if signature is valid, False otherwise
         """
-        if not signature or not payload:
-            return False
-            
         try:
-            # Extract the signature from the header (format: "sha256=<signature>")
-            if not signature.startswith("sha256="):
-                return False
-            
-            provided_signature = signature[7:]  # Remove "sha256=" prefix
-            
-            # Calculate the expected signature using our webhook secret
-            expected_signature = hmac.new(
-                self.webhook_secret.encode('utf-8'),
-                payload,
-                hashlib.sha256
-            ).hexdigest()
-            
-            # Use constant-time comparison to prevent timing attacks
-            return hmac.compare_digest(provided_signature, expected_signature)
-            
-        except Exception:
+            self._ensure_client()
+            self.client.webhooks.verify_signature(
+                payload, headers, secret=self.webhook_secret
+            )
+        except (InvalidWebhookSignatureError, ValueError):
+            # Bad or stale signature, missing headers, or no webhook secret
+            # configured
             return False
+        return True
     
     def parse_webhook_payload(self, payload: bytes) -> Optional[Dict[str, Any]]:
         """
@@ -164,9 +245,13 @@ class OpenAIClient:
             Parsed payload as dictionary, or None if invalid
         """
         try:
-            return json.loads(payload.decode('utf-8'))
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            # orjson parses the raw bytes directly, without decoding to str first
+            parsed = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Also raised for bodies that aren't valid UTF-8
             return None
+        # Webhook events are JSON objects; anything else isn't one of ours
+        return parsed if isinstance(parsed, dict) else None
 
 
 # Global client instance - initialized when module is imported